@@ -9,12 +9,20 @@ Usage: python3 calibrate_zone.py
 """
 
 import cv2
+import numpy as np
 import json
 import os
 import sys
+import time
 import subprocess
 from datetime import datetime
 from dotenv import load_dotenv
+from zone_utils import polygon_from_config
+
+try:
+    import orjson  # Optional: faster JSON, falls back to the stdlib
+except ImportError:
+    orjson = None
 
 # --- Get Version ID ---
 def get_version_id():
@@ -41,6 +49,7 @@ RTSP_URL = os.getenv("RTSP_FEED_URL")
 CAM_USERNAME = os.getenv("CAM_USERNAME") 
 ZONE_CONFIG_FILE = "zone_config.json"
 KEYCHAIN_SERVICE = "AICamMonitor"
+LOG_LEVEL = int(os.getenv("LOG_LEVEL", 1))  # 1 = info, 2 = debug
 
 def get_password_from_keychain(username):
     """Retrieve password from macOS Keychain"""
@@ -71,12 +80,31 @@ def get_password_from_keychain(username):
 # Global state
 points = []
 current_frame = None
+instruction_hud = None  # (point count, text layer, text mask)
+pixel_points_buffer = np.empty((256, 2), np.int32)  # grown if more points are added
 window_name = "Baby Monitor - Safe Zone Calibration"
 
-def log_message(message):
+# Logging
+LOG_INFO = 1
+LOG_DEBUG = 2
+LOG_PREFIX = f"][{VERSION_ID}][calibrate_zone] "
+_log_clock = (None, "")  # (epoch second, formatted timestamp)
+
+def log_message(message, level=LOG_INFO):
     """Unified logging with timestamps and version"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}][{VERSION_ID}][calibrate_zone] {message}")
+    global _log_clock
+    
+    if level > LOG_LEVEL:
+        return
+    
+    # Only reformat the timestamp when the second changes
+    now = int(time.time())
+    second, timestamp = _log_clock
+    if now != second:
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        _log_clock = (now, timestamp)
+    
+    sys.stdout.write(f"[{timestamp}{LOG_PREFIX}{message}\n")
 
 def mouse_callback(event, x, y, flags, param):
     """Handle mouse clicks to define zone points"""
@@ -101,9 +129,36 @@ def mouse_callback(event, x, y, flags, param):
             log_message(f"Removed point: {removed}")
             draw_zone_overlay()
 
+def build_instruction_hud(point_count):
+    """Render the instruction text once into a small layer plus a mask of its pixels"""
+    instructions = [
+        "Left click: Add point",
+        "Right click: Remove last point", 
+        "S: Save zone",
+        "R: Reset all points",
+        "Q: Quit without saving",
+        f"Points: {point_count}/∞"
+    ]
+    
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    text_width = max(cv2.getTextSize(text, font, 0.7, 2)[0][0] for text in instructions)
+    hud = np.zeros((30 * len(instructions) + 15, 10 + text_width + 5, 3), np.uint8)
+    mask = np.zeros(hud.shape[:2], np.uint8)
+    
+    # LINE_8 keeps glyph edges hard so the mask can be a plain on/off copy
+    # (OpenCV 5 antialiases text by default, which would leave dark fringes)
+    y_offset = 30
+    for instruction in instructions:
+        cv2.putText(hud, instruction, (10, y_offset), font, 0.7, (255, 255, 255), 2, cv2.LINE_8)
+        cv2.putText(hud, instruction, (10, y_offset), font, 0.7, (0, 0, 0), 1, cv2.LINE_8)
+        cv2.putText(mask, instruction, (10, y_offset), font, 0.7, 255, 2, cv2.LINE_8)
+        y_offset += 30
+    
+    return hud, mask.astype(bool)[..., None]
+
 def draw_zone_overlay():
     """Draw the current zone polygon on the frame"""
-    global current_frame, points
+    global current_frame, points, instruction_hud, pixel_points_buffer
     
     if current_frame is None:
         return
@@ -112,42 +167,38 @@ def draw_zone_overlay():
     display_frame = current_frame.copy()
     height, width = display_frame.shape[:2]
     
-    # Convert normalized points back to pixel coordinates
-    pixel_points = [(int(x * width), int(y * height)) for x, y in points]
+    # Convert normalized points back to pixel coordinates (into a reused buffer)
+    if len(points) > len(pixel_points_buffer):
+        pixel_points_buffer = np.empty((2 * len(points), 2), np.int32)
+    pixel_points = pixel_points_buffer[:len(points)]
+    if points:
+        pixel_points[:] = np.asarray(points, np.float32) * (width, height)
     
     # Draw points
-    for i, (x, y) in enumerate(pixel_points):
+    for i, (x, y) in enumerate(pixel_points.tolist()):
         cv2.circle(display_frame, (x, y), 8, (0, 255, 0), -1)
         cv2.putText(display_frame, str(i+1), (x+12, y+5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
     
     # Draw polygon lines
     if len(pixel_points) > 1:
-        for i in range(len(pixel_points)):
-            start = pixel_points[i]
-            end = pixel_points[(i + 1) % len(pixel_points)]
-            cv2.line(display_frame, start, end, (0, 255, 255), 2)
+        cv2.polylines(display_frame, [pixel_points], True, (0, 255, 255), 2)
     
-    # Draw polygon fill (semi-transparent)
+    # Draw polygon fill (semi-transparent), blending only the polygon's bounding box
     if len(pixel_points) >= 3:
-        overlay = display_frame.copy()
-        cv2.fillPoly(overlay, [np.array(pixel_points)], (0, 255, 0, 50))
-        cv2.addWeighted(display_frame, 0.7, overlay, 0.3, 0, display_frame)
-    
-    # Add instructions
-    instructions = [
-        "Left click: Add point",
-        "Right click: Remove last point", 
-        "S: Save zone",
-        "R: Reset all points",
-        "Q: Quit without saving",
-        f"Points: {len(points)}/∞"
-    ]
+        x, y, w, h = cv2.boundingRect(pixel_points)
+        region = display_frame[y:y + h, x:x + w]
+        overlay = region.copy()
+        cv2.fillPoly(overlay, [pixel_points - np.array((x, y), np.int32)], (0, 255, 0, 50))
+        cv2.addWeighted(region, 0.7, overlay, 0.3, 0, region)
     
-    y_offset = 30
-    for instruction in instructions:
-        cv2.putText(display_frame, instruction, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(display_frame, instruction, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
-        y_offset += 30
+    # Add instructions (the text only changes with the point count)
+    if instruction_hud is None or instruction_hud[0] != len(points):
+        instruction_hud = (len(points), *build_instruction_hud(len(points)))
+    _, hud, hud_mask = instruction_hud
+    hud_height = min(hud.shape[0], height)
+    hud_width = min(hud.shape[1], width)
+    np.copyto(display_frame[:hud_height, :hud_width], hud[:hud_height, :hud_width],
+              where=hud_mask[:hud_height, :hud_width])
     
     cv2.imshow(window_name, display_frame)
 
@@ -169,36 +220,51 @@ def save_zone_config():
         "points": [{"x": x, "y": y} for x, y in points]
     }
     
+    if orjson is not None:
+        config_bytes = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        config_bytes = json.dumps(config, indent=2).encode()
+    
+    # Write to a temp file and rename so a crash never leaves a truncated config
+    temp_file = ZONE_CONFIG_FILE + ".tmp"
     try:
-        with open(ZONE_CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        with open(temp_file, 'wb') as f:
+            f.write(config_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, ZONE_CONFIG_FILE)
         log_message(f"Zone configuration saved to {ZONE_CONFIG_FILE}")
         log_message(f"Zone '{zone_name}' has {len(points)} points")
         return True
     except Exception as e:
         log_message(f"Error saving zone config: {e}")
+        try:
+            os.unlink(temp_file)
+        except OSError:
+            pass
         return False
 
 def load_existing_zone():
-    """Load existing zone if available"""
+    """Load existing zone if available, returning its float32 polygon array (or None)"""
     global points
     
     if os.path.exists(ZONE_CONFIG_FILE):
         try:
-            with open(ZONE_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+            with open(ZONE_CONFIG_FILE, 'rb') as f:
+                config_bytes = f.read()
+            config = orjson.loads(config_bytes) if orjson is not None else json.loads(config_bytes)
             
             points = [(point["x"], point["y"]) for point in config["points"]]
             log_message(f"Loaded existing zone '{config['name']}' with {len(points)} points")
-            return True
+            return polygon_from_config(config)
         except Exception as e:
             log_message(f"Error loading existing zone: {e}")
-            return False
-    return False
+            return None
+    return None
 
 def main():
     """Main calibration function"""
-    global current_frame
+    global current_frame, points
     
     log_message("Safe Zone Calibration Tool starting...")
     
@@ -215,7 +281,7 @@ def main():
         return 1
     
     # Check for existing zone
-    if load_existing_zone():
+    if load_existing_zone() is not None:
         print(f"\nFound existing zone configuration with {len(points)} points.")
         response = input("Do you want to (E)dit existing zone or (N)ew zone? [E/n]: ").strip().upper()
         if response == 'N':
@@ -298,5 +364,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    import numpy as np
     sys.exit(main())
\ No newline at end of file
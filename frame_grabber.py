@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
-import cv2
 import os
+
+# One stream at a low frame rate gains nothing from OpenCV's thread pool; must be set before cv2 loads.
+# Only applies to this process - inference runs in the Swift app with its own scheduling.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import cv2
+import numpy as np
 import time
 import sys
 import socket
 import struct
 import signal
+import threading
+from multiprocessing import shared_memory
 import subprocess
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    import ffmpegcv  # Optional: NVDEC decoding through an ffmpeg subprocess
+except (ImportError, RuntimeError):
+    # RuntimeError: ffmpegcv checks for ffmpeg/ffprobe on PATH at import time
+    ffmpegcv = None
+
+try:
+    # Optional: libjpeg-turbo SIMD encoder that can write into a reusable buffer
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
 # --- Get Version ID ---
 def get_version_id():
     """Get git commit hash or fallback to timestamp"""
@@ -35,19 +55,60 @@ load_dotenv("config.env")
 RTSP_URL = os.getenv("RTSP_FEED_URL")
 CAM_USERNAME = os.getenv("CAM_USERNAME")
 FRAME_RATE = int(os.getenv("FRAME_RATE", 1))
+HW_DECODE = os.getenv("HW_DECODE", "auto").lower()  # auto, cuvid or off
+RAW_FRAMES = os.getenv("RAW_FRAMES", "false").lower() == "true"
+TARGET_WIDTH = int(os.getenv("TARGET_WIDTH", 0))  # 0 = send frames at stream resolution
+SHM_FRAMES = os.getenv("SHM_FRAMES", "false").lower() == "true"
+LOG_LEVEL = int(os.getenv("LOG_LEVEL", 1))  # 1 = info, 2 = debug
 SOCKET_PATH = "/tmp/aicam.sock"
+SOCKET_SEND_BUFFER = 4 << 20
+STREAM_TIMEOUT_MS = 5000
+JPEG_QUALITY = 85
+JPEG_ENCODE_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+
+# Shared-memory frame ring (must match SocketManager in main.swift)
+# A POSIX shm_open() segment, so frames stay in RAM (a file under /tmp would be written back to disk)
+SHM_NAME = "aicam_frames"
+SHM_SLOTS = 4
+SHM_SLOT_SIZE = 32 * 1024 * 1024
+SHM_SLOT_HEADER = struct.Struct('<QI4x')  # sequence, length
+SHM_MESSAGE = struct.Struct('<IIQ')  # slot, length, sequence
 KEYCHAIN_SERVICE = "AICamMonitor"
 
 # Global state for graceful shutdown
 server_socket = None
 client_connection = None
 capture = None
+frame_ring = None
+ring_sequence = 0
+jpeg_encoder = None
+frame_ready = threading.Condition()
+latest_frame = None
+latest_frame_id = 0
+jpeg_buffer = None
 running = True
 
-def log_message(message):
+# --- Logging ---
+LOG_INFO = 1
+LOG_DEBUG = 2
+LOG_PREFIX = f"][{VERSION_ID}][frame_grabber.py] "
+_log_clock = (None, "")  # (epoch second, formatted timestamp)
+
+def log_message(message, level=LOG_INFO):
     """Unified logging format with timestamps and version"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}][{VERSION_ID}][frame_grabber.py] {message}")
+    global _log_clock
+    
+    if level > LOG_LEVEL:
+        return
+    
+    # Only reformat the timestamp when the second changes
+    now = int(time.time())
+    second, timestamp = _log_clock
+    if now != second:
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        _log_clock = (now, timestamp)
+    
+    sys.stdout.write(f"[{timestamp}{LOG_PREFIX}{message}\n")
     sys.stdout.flush()
 
 def get_password_from_keychain(username):
@@ -84,7 +145,7 @@ def signal_handler(sig, frame):
 
 def cleanup():
     """Clean up resources"""
-    global server_socket, client_connection, capture
+    global server_socket, client_connection, capture, frame_ring
     
     if capture:
         capture.release()
@@ -104,12 +165,21 @@ def cleanup():
             pass
         server_socket = None
     
-    if os.path.exists(SOCKET_PATH):
+    if frame_ring:
+        frame_ring.close()
         try:
-            os.unlink(SOCKET_PATH)
-            log_message("Socket file removed")
-        except OSError as e:
-            log_message(f"Warning: Could not remove socket file: {e}")
+            frame_ring.unlink()
+        except OSError:
+            pass
+        frame_ring = None
+    
+    try:
+        os.unlink(SOCKET_PATH)
+        log_message("Socket file removed")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log_message(f"Warning: Could not remove socket file: {e}")
 
 def validate_configuration():
     """Validate that all required configuration is present"""
@@ -132,13 +202,18 @@ def create_server_socket():
     """Create and bind the Unix Domain Socket server"""
     global server_socket
     
+    # The ring must exist before clients can connect and open it
+    if SHM_FRAMES and not create_frame_ring():
+        return False
+    
     # Clean up any existing socket
-    if os.path.exists(SOCKET_PATH):
-        try:
-            os.unlink(SOCKET_PATH)
-        except OSError as e:
-            log_message(f"Error removing existing socket: {e}")
-            return False
+    try:
+        os.unlink(SOCKET_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log_message(f"Error removing existing socket: {e}")
+        return False
 
     try:
         server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -150,6 +225,50 @@ def create_server_socket():
         log_message(f"Error creating server socket: {e}")
         return False
 
+def create_frame_ring():
+    """Create the shared-memory ring that frames are written into"""
+    global frame_ring
+    
+    ring_size = SHM_SLOTS * SHM_SLOT_SIZE
+    try:
+        # Remove a segment left behind by a crashed run; shm segments outlive their process
+        try:
+            stale = shared_memory.SharedMemory(name=SHM_NAME)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        
+        frame_ring = shared_memory.SharedMemory(name=SHM_NAME, create=True, size=ring_size)
+        log_message(f"Shared-memory frame ring ready at /{SHM_NAME} ({SHM_SLOTS} x {SHM_SLOT_SIZE // (1024 * 1024)} MB)")
+        return True
+    except OSError as e:
+        log_message(f"Error creating shared-memory frame ring: {e}")
+        return False
+
+def write_frame_to_ring(frame_parts, size):
+    """Copy a frame into the next ring slot and return the notification message"""
+    global ring_sequence
+    
+    if size > SHM_SLOT_SIZE - SHM_SLOT_HEADER.size:
+        return None
+    
+    ring_sequence += 1
+    slot = ring_sequence % SHM_SLOTS
+    offset = slot * SHM_SLOT_SIZE
+    
+    # Invalidate the slot first so a lagging reader can detect the overwrite
+    ring = frame_ring.buf
+    SHM_SLOT_HEADER.pack_into(ring, offset, 0, 0)
+    position = offset + SHM_SLOT_HEADER.size
+    for part in frame_parts:
+        part = memoryview(part).cast('B')
+        ring[position:position + len(part)] = part
+        position += len(part)
+    SHM_SLOT_HEADER.pack_into(ring, offset, ring_sequence, size)
+    
+    return SHM_MESSAGE.pack(slot, size, ring_sequence)
+
 def wait_for_client():
     """Wait for Swift client to connect"""
     global client_connection, running
@@ -162,6 +281,11 @@ def wait_for_client():
             try:
                 client_connection, _ = server_socket.accept()
                 client_connection.settimeout(5.0)
+                try:
+                    # Room for a few full frames so bursts don't block the sender
+                    client_connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SEND_BUFFER)
+                except OSError as e:
+                    log_message(f"Warning: Could not raise socket send buffer: {e}")
                 log_message("Swift client connected")
                 return True
             except socket.timeout:
@@ -173,6 +297,98 @@ def wait_for_client():
     except KeyboardInterrupt:
         return False
 
+HW_ACCELERATION_NAMES = {
+    getattr(cv2, "VIDEO_ACCELERATION_D3D11", 2): "D3D11",
+    getattr(cv2, "VIDEO_ACCELERATION_VAAPI", 3): "VAAPI",
+    getattr(cv2, "VIDEO_ACCELERATION_MFX", 4): "MFX",
+}
+
+def stream_timeout_params():
+    """Open/read timeouts so a dead stream fails fast instead of hanging (OpenCV 4.5.2+)"""
+    if not hasattr(cv2, "CAP_PROP_READ_TIMEOUT_MSEC"):
+        return []
+    return [
+        cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, STREAM_TIMEOUT_MS,
+        cv2.CAP_PROP_READ_TIMEOUT_MSEC, STREAM_TIMEOUT_MS
+    ]
+
+def open_cpu_capture(auth_url):
+    """Open the stream with software decoding, using timeouts when the build supports them"""
+    timeout_params = stream_timeout_params()
+    if not timeout_params:
+        # Builds without the timeout properties also lack the params constructor
+        return cv2.VideoCapture(auth_url)
+    return cv2.VideoCapture(auth_url, cv2.CAP_FFMPEG, timeout_params)
+
+_nvidia_gpu_count = None
+
+def nvidia_gpu_available():
+    """Check once for an NVIDIA GPU, so hosts without one skip ffmpegcv's RTSP probe"""
+    global _nvidia_gpu_count
+    
+    if _nvidia_gpu_count is None:
+        try:
+            _nvidia_gpu_count = ffmpegcv.video_info.get_num_NVIDIA_GPUs()
+        except Exception:
+            _nvidia_gpu_count = 0
+        if not _nvidia_gpu_count:
+            log_message("No NVIDIA GPU found, not using ffmpegcv")
+    return _nvidia_gpu_count > 0
+
+def open_video_capture(auth_url):
+    """Open the stream with hardware decoding, falling back to CPU decoding"""
+    if HW_DECODE == "off":
+        return open_cpu_capture(auth_url)
+    
+    if ffmpegcv is not None and nvidia_gpu_available():
+        cap = None
+        try:
+            # codec=None lets ffmpegcv map the probed codec (H.264/HEVC) to its NVDEC decoder.
+            # TARGET_WIDTH downscaling is left to capture_and_send_loop, which uses the real frame shape.
+            cap = ffmpegcv.VideoCaptureStreamRT(auth_url, codec=None, pix_fmt='bgr24', gpu=0)
+            # isOpened() is always true here; ffmpeg only starts on the first read
+            ret, test_frame = cap.read()
+            if ret and test_frame is not None:
+                log_message("NVIDIA decoding enabled via ffmpegcv")
+                return cap
+            log_message("ffmpegcv could not decode the stream on the GPU")
+        except Exception as e:
+            log_message(f"ffmpegcv GPU decoding unavailable: {e}")
+        if cap is not None:
+            cap.release()
+    
+    # FFmpeg reads its options from the environment when the capture is opened
+    if HW_DECODE == "cuvid":
+        os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "hwaccel;cuvid|video_codec;h264_cuvid|rtsp_transport;tcp|vsync;0"
+    else:
+        os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "rtsp_transport;tcp")
+    
+    try:
+        cap = cv2.VideoCapture(auth_url, cv2.CAP_FFMPEG, [
+            cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+            cv2.CAP_PROP_HW_DEVICE, 0
+        ] + stream_timeout_params())
+        if cap.isOpened():
+            # ANY is only a preference: OpenCV silently opens a software decoder when
+            # no HW backend (VAAPI, D3D11, MFX) is available, so report what it chose
+            hw_mode = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+            if hw_mode != cv2.VIDEO_ACCELERATION_NONE:
+                log_message(f"Hardware-accelerated decoding enabled ({HW_ACCELERATION_NAMES.get(hw_mode, hw_mode)})")
+            elif HW_DECODE == "cuvid":
+                log_message("Decoding with h264_cuvid via OPENCV_FFMPEG_CAPTURE_OPTIONS")
+            else:
+                log_message("No hardware decoder available in this OpenCV build, using software decoding")
+            return cap
+        cap.release()
+    except (cv2.error, AttributeError) as e:
+        # AttributeError: OpenCV builds older than 4.5.2 lack the HW properties
+        log_message(f"Hardware decoding unavailable: {e}")
+    
+    log_message("Falling back to CPU decoding")
+    if HW_DECODE == "cuvid":
+        del os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"]
+    return open_cpu_capture(auth_url)
+
 def create_rtsp_connection():
     """Create connection to RTSP stream with retries"""
     # Get password from Keychain
@@ -188,17 +404,20 @@ def create_rtsp_connection():
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            cap = cv2.VideoCapture(auth_url)
+            start_time = time.monotonic()
+            cap = open_video_capture(auth_url)
             
             # Configure capture properties for better performance
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            cap.set(cv2.CAP_PROP_FPS, FRAME_RATE)
+            # (ffmpegcv readers have no set(); they always deliver the latest frame)
+            if isinstance(cap, cv2.VideoCapture):
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                cap.set(cv2.CAP_PROP_FPS, FRAME_RATE)
             
             if cap.isOpened():
                 # Test if we can actually read a frame
                 ret, test_frame = cap.read()
                 if ret and test_frame is not None:
-                    log_message(f"Successfully connected to stream (attempt {attempt + 1})")
+                    log_message(f"Successfully connected to stream in {time.monotonic() - start_time:.2f}s (attempt {attempt + 1})")
                     return cap
                 else:
                     log_message(f"Connected but cannot read frames (attempt {attempt + 1})")
@@ -215,15 +434,68 @@ def create_rtsp_connection():
     
     return None
 
-def send_frame_data(frame_data):
+def create_jpeg_encoder():
+    """Load TurboJPEG if both the package and the native library are present"""
+    if TurboJPEG is None:
+        return None
+    try:
+        encoder = TurboJPEG()
+        log_message("Using libjpeg-turbo for JPEG encoding")
+        return encoder
+    except (OSError, RuntimeError) as e:
+        log_message(f"TurboJPEG unavailable, using OpenCV JPEG encoder: {e}")
+        return None
+
+def encode_jpeg(frame):
+    """Encode a frame as JPEG, reusing one output buffer when TurboJPEG is available"""
+    global jpeg_buffer
+    
+    if jpeg_encoder is None:
+        ret, jpeg_data = cv2.imencode('.jpg', frame, JPEG_ENCODE_PARAMS)
+        return jpeg_data if ret else None
+    
+    # Grow the buffer only when the frame size goes up; it is reused otherwise
+    required_size = jpeg_encoder.buffer_size(frame, TJSAMP_420)
+    if jpeg_buffer is None or len(jpeg_buffer) < required_size:
+        jpeg_buffer = np.empty(required_size, np.uint8)
+    
+    # 4:2:0 matches OpenCV's default subsampling, so output quality is unchanged
+    jpeg_buffer, jpeg_size = jpeg_encoder.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR,
+                                                 jpeg_subsample=TJSAMP_420, dst=jpeg_buffer)
+    return memoryview(jpeg_buffer)[:jpeg_size]
+
+def send_buffers(connection, buffers):
+    """Like sendall(), but writes all buffers with a single sendmsg() where possible"""
+    pending = [memoryview(buffer).cast('B') for buffer in buffers]
+    
+    while pending:
+        sent = connection.sendmsg(pending)
+        # Drop what was written; partial sends are rare on a Unix socket
+        while sent:
+            if sent >= len(pending[0]):
+                sent -= len(pending[0])
+                pending.pop(0)
+            else:
+                pending[0] = pending[0][sent:]
+                sent = 0
+
+def send_frame_data(*frame_parts):
     """Send frame data to Swift client with error handling"""
     try:
-        # Send size header (little-endian)
-        size_bytes = struct.pack('<I', len(frame_data))
-        client_connection.sendall(size_bytes)
+        frame_size = sum(len(part) for part in frame_parts)
         
-        # Send frame data
-        client_connection.sendall(frame_data)
+        if frame_ring is not None:
+            # Pixels go through shared memory; the socket only carries the slot
+            message = write_frame_to_ring(frame_parts, frame_size)
+            if message is None:
+                log_message(f"Frame of {frame_size} bytes exceeds ring slot size, dropping")
+                return True
+            client_connection.sendall(message)
+            return True
+        
+        # Size header (little-endian) and frame data go out in one writev
+        size_bytes = struct.pack('<I', frame_size)
+        send_buffers(client_connection, (size_bytes, *frame_parts))
         return True
         
     except (BrokenPipeError, ConnectionResetError, socket.timeout):
@@ -233,85 +505,159 @@ def send_frame_data(frame_data):
         log_message(f"Error sending frame: {e}")
         return False
 
-def capture_and_send_loop():
-    """Main capture and send loop"""
-    global capture, running
+def read_frames_loop(stop_event):
+    """Keep reading the stream and publish the newest frame (runs on its own thread)"""
+    global capture, latest_frame, latest_frame_id
     
     capture_interval = 1.0 / FRAME_RATE
-    last_capture_time = 0
-    frame_count = 0
+    next_frame_due = time.monotonic()
     connection_failures = 0
+    quick_retries = 3  # Cheap retries for transient jitter before backing off
     max_connection_failures = 5
     
-    while running:
+    while running and not stop_event.is_set():
         # Create/recreate RTSP connection if needed
         if not capture:
             capture = create_rtsp_connection()
             if not capture:
                 log_message("Failed to connect to RTSP stream, retrying in 10 seconds...")
-                time.sleep(10)
+                stop_event.wait(10)
                 continue
             connection_failures = 0
         
         try:
-            ret, frame = capture.read()
-            if not ret or frame is None:
+            frame = None
+            if isinstance(capture, cv2.VideoCapture):
+                # grab() still fully decodes every frame: H.264 reference frames can't be
+                # skipped, and not reading would only back up the RTSP buffer. Only the
+                # BGR conversion and copy in retrieve() are saved for frames we drop.
+                ret = capture.grab()
+                if ret and time.monotonic() >= next_frame_due:
+                    ret, frame = capture.retrieve()
+                    ret = ret and frame is not None
+            else:
+                ret, frame = capture.read()
+                ret = ret and frame is not None
+            
+            if not ret:
                 connection_failures += 1
-                log_message(f"Failed to read frame (failure #{connection_failures})")
+                log_message(f"Failed to read frame (failure #{connection_failures})", LOG_DEBUG)
                 
-                if connection_failures >= max_connection_failures:
-                    log_message("Too many connection failures, recreating connection...")
+                # Tearing down the capture means a full RTSP handshake and decoder
+                # re-init, so only do it once the stream is really gone
+                if not capture.isOpened() or connection_failures >= max_connection_failures:
+                    if not capture.isOpened():
+                        log_message("Stream closed by capture backend, recreating connection...")
+                    else:
+                        log_message("Too many connection failures, recreating connection...")
                     capture.release()
                     capture = None
-                    time.sleep(5)
-                    continue
+                    stop_event.wait(5)
+                elif connection_failures <= quick_retries:
+                    stop_event.wait(0.2)
                 else:
-                    time.sleep(1)
-                    continue
+                    stop_event.wait(1)
+                continue
             
             # Reset failure counter on successful read
             connection_failures = 0
             
-            # Frame rate control
-            current_time = time.time()
-            if (current_time - last_capture_time) < capture_interval:
-                continue
-            
-            last_capture_time = current_time
-            frame_count += 1
-            
-            # Encode frame as JPEG
-            encode_params = [cv2.IMWRITE_JPEG_QUALITY, 85]
-            ret, jpeg_data = cv2.imencode('.jpg', frame, encode_params)
-            
-            if not ret or jpeg_data is None:
-                log_message("Error encoding frame to JPEG")
+            # Frame rate control on a monotonic deadline
+            now = time.monotonic()
+            if frame is None or now < next_frame_due:
                 continue
+            next_frame_due += capture_interval
+            if next_frame_due < now:
+                next_frame_due = now + capture_interval
             
-            # Send to Swift client
-            if not send_frame_data(jpeg_data):
-                log_message("Client disconnected, waiting for reconnection...")
-                break
-            
-            # Log progress every 50 frames
-            if frame_count % 50 == 0:
-                log_message(f"👶 Sent frame #{frame_count} ({len(jpeg_data)} bytes)")
+            with frame_ready:
+                latest_frame = frame
+                latest_frame_id += 1
+                frame_ready.notify()
                 
         except Exception as e:
-            log_message(f"Unexpected error in capture loop: {e}")
-            time.sleep(1)
+            log_message(f"Unexpected error in reader thread: {e}")
+            stop_event.wait(1)
     
     # Cleanup capture
     if capture:
         capture.release()
         capture = None
 
+def capture_and_send_loop():
+    """Main capture and send loop"""
+    global latest_frame
+    
+    frame_count = 0
+    
+    # Decoding runs on a separate thread so RTSP/decoder stalls don't delay encoding.
+    # latest_frame_id carries over from the previous client, so start counting from it.
+    with frame_ready:
+        latest_frame = None
+        sent_frame_id = latest_frame_id
+    stop_event = threading.Event()
+    reader = threading.Thread(target=read_frames_loop, args=(stop_event,), name="frame-reader", daemon=True)
+    reader.start()
+    
+    try:
+        while running:
+            # The reader thread paces frames to FRAME_RATE; block until it publishes one
+            with frame_ready:
+                frame_ready.wait_for(
+                    lambda: (latest_frame is not None and latest_frame_id != sent_frame_id) or not running,
+                    timeout=1.0)
+                frame, frame_id = latest_frame, latest_frame_id
+            if frame is None or frame_id == sent_frame_id:
+                continue
+            
+            sent_frame_id = frame_id
+            frame_count += 1
+            
+            try:
+                # Downscale before encoding; JPEG cost and socket bytes scale with pixel count
+                height, width = frame.shape[:2]
+                if 0 < TARGET_WIDTH < width:
+                    target_size = (TARGET_WIDTH, round(height * TARGET_WIDTH / width))
+                    frame = cv2.resize(frame, target_size, interpolation=cv2.INTER_AREA)
+                
+                if RAW_FRAMES:
+                    # Local socket: ship the BGR pixels as-is instead of spending CPU on JPEG
+                    height, width, channels = frame.shape
+                    frame_parts = (struct.pack('<III', height, width, channels), memoryview(frame).cast('B'))
+                else:
+                    # Encode frame as JPEG
+                    jpeg_data = encode_jpeg(frame)
+                    
+                    if jpeg_data is None:
+                        log_message("Error encoding frame to JPEG")
+                        continue
+                    frame_parts = (jpeg_data,)
+                
+                # Send to Swift client
+                if not send_frame_data(*frame_parts):
+                    log_message("Client disconnected, waiting for reconnection...")
+                    break
+                
+                # Log progress every 50 frames
+                if frame_count % 50 == 0:
+                    log_message(f"👶 Sent frame #{frame_count} ({sum(len(part) for part in frame_parts)} bytes)", LOG_DEBUG)
+                    
+            except Exception as e:
+                log_message(f"Unexpected error in capture loop: {e}")
+                time.sleep(1)
+    finally:
+        stop_event.set()
+        reader.join()
+
 def main():
     """Main function"""
-    global running
+    global running, jpeg_encoder, client_connection
     
     log_message("👶 Baby Monitor Frame Grabber starting...")
     
+    # Avoid oversubscribing cores alongside the reader thread
+    cv2.setNumThreads(1)
+    
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -321,6 +667,8 @@ def main():
         if not validate_configuration():
             return 1
         
+        jpeg_encoder = create_jpeg_encoder()
+        
         # Create server socket
         if not create_server_socket():
             return 1
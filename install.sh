@@ -53,7 +53,7 @@ if [[ ! -d ".venv" ]]; then
         log_message "Warning: Could not upgrade pip, proceeding anyway"
     fi
     
-    if pip install ultralytics coremltools opencv-python python-dotenv >> "$LOG_FILE" 2>&1; then
+    if pip install ultralytics coremltools opencv-python python-dotenv PyTurboJPEG orjson numba scikit-learn >> "$LOG_FILE" 2>&1; then
         log_message "Python packages installed successfully"
     else
         log_message "Error installing Python packages"
@@ -69,18 +69,32 @@ else
     
     # Check if packages are installed
     source .venv/bin/activate
-    if python3 -c "import cv2, ultralytics, coremltools" 2>/dev/null; then
+    if python3 -c "import cv2, ultralytics, coremltools, turbojpeg, orjson, numba, sklearn" 2>/dev/null; then
         log_message "Required Python packages are already installed"
         echo "   > Required packages are installed ✓"
     else
         log_message "Some Python packages missing, installing..."
-        pip install ultralytics coremltools opencv-python python-dotenv >> "$LOG_FILE" 2>&1
+        pip install ultralytics coremltools opencv-python python-dotenv PyTurboJPEG orjson numba scikit-learn >> "$LOG_FILE" 2>&1
         log_message "Missing packages installed"
         echo "   > Missing packages installed ✓"
     fi
     deactivate
 fi
 
+# PyTurboJPEG only wraps libjpeg-turbo; without the native library it falls back to OpenCV
+if command -v brew >/dev/null 2>&1; then
+    if brew list jpeg-turbo >/dev/null 2>&1; then
+        echo "   > libjpeg-turbo is installed ✓"
+    elif brew install jpeg-turbo >> "$LOG_FILE" 2>&1; then
+        log_message "libjpeg-turbo installed via Homebrew"
+        echo "   > libjpeg-turbo installed ✓"
+    else
+        log_message "Warning: Could not install libjpeg-turbo, JPEG encoding will use OpenCV"
+    fi
+else
+    log_message "Warning: Homebrew not found, install libjpeg-turbo manually for faster JPEG encoding"
+fi
+
 # --- 2. Configuration Validation ---
 echo "[2/3] Validating configuration..." | tee -a "$LOG_FILE"
 
@@ -95,6 +109,12 @@ DETECTION_THRESHOLD=0.3
 FRAME_RATE=2
 FRAME_WIDTH=1920
 FRAME_HEIGHT=1080
+TARGET_WIDTH=0
+PALETTIZE_MODEL=false
+LOG_LEVEL=1
+HW_DECODE=auto
+RAW_FRAMES=false
+SHM_FRAMES=false
 SNAPSHOT_ON_DETECTION=true
 SNAPSHOT_DIRECTORY=./BabyCaptures
 NOTIFICATION_COOLDOWN=30
@@ -167,15 +187,28 @@ else
     
     source .venv/bin/activate
     
-    # Download and export model
-    python3 -c "
+    # Download and export model (optionally with 8-bit palettized weights)
+    PALETTIZE_MODEL="${PALETTIZE_MODEL:-false}" python3 -c "
 from ultralytics import YOLO
+import os
 import sys
 try:
     print('Downloading YOLOv8 model...')
     model = YOLO('yolov8n.pt')
-    print('Exporting to CoreML format...')
-    model.export(format='coreml', nms=True, half=True)
+    # ultralytics' int8 flag palettizes the weights (8-bit k-means lookup table, needs
+    # scikit-learn) before building the NMS pipeline. This shrinks the model on disk and
+    # in memory; the Neural Engine still computes in FP16.
+    exported = False
+    if os.environ.get('PALETTIZE_MODEL', 'false').lower() == 'true':
+        try:
+            print('Exporting to CoreML format with 8-bit palettized weights...')
+            model.export(format='coreml', imgsz=640, nms=True, int8=True)
+            exported = True
+        except Exception as e:
+            print(f'Warning: palettized export failed, falling back to FP16: {e}')
+    if not exported:
+        print('Exporting to CoreML format...')
+        model.export(format='coreml', imgsz=640, nms=True, half=True)
     print('Model export completed successfully')
 except Exception as e:
     print(f'Error exporting model: {e}')
@@ -3,6 +3,7 @@ import Vision
 import CoreML
 import AppKit
 import CoreImage
+import Accelerate
 
 // --- Global Logger ---
 class Logger {
@@ -115,6 +116,9 @@ struct AppConfig {
     let safeZone: SafeZone?
     let frameWidth: Int
     let frameHeight: Int
+    let rawFrames: Bool
+    let sharedMemoryFrames: Bool
+    let sharedMemoryName = "/aicam_frames"
     let rtspUrl: String
     let alertRecipients: [String]
 
@@ -154,6 +158,8 @@ struct AppConfig {
         self.notificationCooldown = TimeInterval(configDict["NOTIFICATION_COOLDOWN"] ?? "30") ?? 30
         self.frameWidth = Int(configDict["FRAME_WIDTH"] ?? "1920") ?? 1920
         self.frameHeight = Int(configDict["FRAME_HEIGHT"] ?? "1080") ?? 1080
+        self.rawFrames = (configDict["RAW_FRAMES"] ?? "false").lowercased() == "true"
+        self.sharedMemoryFrames = (configDict["SHM_FRAMES"] ?? "false").lowercased() == "true"
         
         // Load alert recipients
         self.alertRecipients = [
@@ -206,14 +212,38 @@ class AIModelManager {
             return nil
         }
         
+        // Keep inference on the Neural Engine (with CPU fallback) rather than letting it land on the GPU
+        let configuration = MLModelConfiguration()
+        if #available(macOS 13.0, *) {
+            configuration.computeUnits = .cpuAndNeuralEngine
+        } else {
+            configuration.computeUnits = .all
+        }
+        
         do {
-            let mlModel = try MLModel(contentsOf: modelURL)
+            let mlModel = try MLModel(contentsOf: modelURL, configuration: configuration)
             self.model = try VNCoreMLModel(for: mlModel)
             Logger.log("AI Model loaded successfully from \(modelURL.lastPathComponent)")
         } catch {
             Logger.log("Error loading AI model: \(error)")
             return nil
         }
+        
+        warmUp()
+    }
+    
+    /// Runs one inference on a blank 640x640 frame so kernel specialization happens at startup, not on the first real frame.
+    private func warmUp() {
+        var pixelBuffer: CVPixelBuffer?
+        guard CVPixelBufferCreate(kCFAllocatorDefault, 640, 640, kCVPixelFormatType_32BGRA, nil, &pixelBuffer) == kCVReturnSuccess,
+              let buffer = pixelBuffer else {
+            Logger.log("Warning: Could not create warm-up buffer, skipping model warm-up")
+            return
+        }
+        
+        let start = Date()
+        performDetection(on: buffer) { _ in }
+        Logger.log("AI Model warmed up in \(Int(Date().timeIntervalSince(start) * 1000)) ms")
     }
 
     func performDetection(on buffer: CVImageBuffer, completion: @escaping ([(label: String, confidence: Float, box: CGRect)]) -> Void) {
@@ -333,15 +363,29 @@ class FrameProcessor {
             Logger.log("Processing frame #\(self.frameCount), size: \(data.count) bytes")
         }
 
-        guard let image = NSImage(data: data), 
-              let cgImage = image.cgImage(forProposedRect: nil, context: nil, hints: nil) else {
-            Logger.log("Warning: Could not decode JPEG data for frame #\(self.frameCount)")
-            return
-        }
+        let pixelBuffer: CVPixelBuffer
+        let frameSize: CGSize
+        
+        if config.rawFrames {
+            guard let buffer = createPixelBufferFromRawFrame(data) else {
+                Logger.log("Warning: Failed to create pixel buffer from raw frame #\(self.frameCount)")
+                return
+            }
+            pixelBuffer = buffer
+            frameSize = CGSize(width: CVPixelBufferGetWidth(buffer), height: CVPixelBufferGetHeight(buffer))
+        } else {
+            guard let image = NSImage(data: data), 
+                  let cgImage = image.cgImage(forProposedRect: nil, context: nil, hints: nil) else {
+                Logger.log("Warning: Could not decode JPEG data for frame #\(self.frameCount)")
+                return
+            }
 
-        guard let pixelBuffer = createPixelBufferFromCGImage(cgImage) else {
-            Logger.log("Warning: Failed to create pixel buffer for frame #\(self.frameCount)")
-            return
+            guard let buffer = createPixelBufferFromCGImage(cgImage) else {
+                Logger.log("Warning: Failed to create pixel buffer for frame #\(self.frameCount)")
+                return
+            }
+            pixelBuffer = buffer
+            frameSize = cgImage.size
         }
 
         modelManager.performDetection(on: pixelBuffer) { [weak self] detections in
@@ -355,7 +399,7 @@ class FrameProcessor {
             
             if !filtered.isEmpty {
                 DispatchQueue.main.async {
-                    self.handleDetection(detections: filtered, frame: pixelBuffer, originalData: data, frameSize: cgImage.size)
+                    self.handleDetection(detections: filtered, frame: pixelBuffer, originalData: data, frameSize: frameSize)
                 }
             }
         }
@@ -451,6 +495,55 @@ class FrameProcessor {
         return buffer
     }
 
+    /// Raw frames are a little-endian (height, width, channels) UInt32 header followed by packed BGR pixels.
+    private func createPixelBufferFromRawFrame(_ data: Data) -> CVPixelBuffer? {
+        let headerSize = 3 * MemoryLayout<UInt32>.size
+        guard data.count > headerSize else { return nil }
+        
+        let header = data.prefix(headerSize).withUnsafeBytes { ptr in
+            (0..<3).map { Int(UInt32(littleEndian: ptr.loadUnaligned(fromByteOffset: $0 * 4, as: UInt32.self))) }
+        }
+        let height = header[0], width = header[1], channels = header[2]
+        
+        guard channels == 3, data.count - headerSize == width * height * channels else {
+            Logger.log("Error: Raw frame header does not match payload (\(width)x\(height)x\(channels), \(data.count) bytes)")
+            return nil
+        }
+        
+        var pixelBuffer: CVPixelBuffer?
+        let options: [String: Any] = [
+            kCVPixelBufferCGImageCompatibilityKey as String: true,
+            kCVPixelBufferCGBitmapContextCompatibilityKey as String: true
+        ]
+        
+        let status = CVPixelBufferCreate(kCFAllocatorDefault, width, height, kCVPixelFormatType_32BGRA, options as CFDictionary, &pixelBuffer)
+        guard status == kCVReturnSuccess, let buffer = pixelBuffer else {
+            Logger.log("Error: Failed to create pixel buffer (status: \(status))")
+            return nil
+        }
+        
+        CVPixelBufferLockBaseAddress(buffer, [])
+        defer { CVPixelBufferUnlockBaseAddress(buffer, []) }
+        
+        // vImage treats channels positionally, so "RGB888 -> RGBA8888" turns BGR into BGRA
+        let error = data.withUnsafeBytes { (ptr: UnsafeRawBufferPointer) -> vImage_Error in
+            var src = vImage_Buffer(data: UnsafeMutableRawPointer(mutating: ptr.baseAddress! + headerSize),
+                                    height: vImagePixelCount(height), width: vImagePixelCount(width),
+                                    rowBytes: width * channels)
+            var dest = vImage_Buffer(data: CVPixelBufferGetBaseAddress(buffer),
+                                     height: vImagePixelCount(height), width: vImagePixelCount(width),
+                                     rowBytes: CVPixelBufferGetBytesPerRow(buffer))
+            return vImageConvert_RGB888toRGBA8888(&src, nil, 255, &dest, false, vImage_Flags(kvImageNoFlags))
+        }
+        
+        guard error == kvImageNoError else {
+            Logger.log("Error: Failed to convert raw frame (vImage error: \(error))")
+            return nil
+        }
+        
+        return buffer
+    }
+
     private func saveFrameAsJPEG(pixelBuffer: CVPixelBuffer, at url: URL) -> Bool {
         let ciImage = CIImage(cvPixelBuffer: pixelBuffer)
         let context = CIContext()
@@ -480,12 +573,21 @@ extension CGImage {
 
 // --- Socket Connection Manager ---
 class SocketManager {
+    // Shared-memory frame ring layout (must match frame_grabber.py)
+    private static let ringSlots = 4
+    private static let ringSlotSize = 32 * 1024 * 1024
+    private static let ringSlotHeaderSize = 16
+    private static let ringMessageSize = 16
+    
     private let socketPath: String
+    private let ringName: String?
     private var clientSocket: Int32 = -1
     private var isConnected = false
+    private var ringBase: UnsafeMutableRawPointer?
     
-    init(socketPath: String) {
+    init(socketPath: String, ringName: String? = nil) {
         self.socketPath = socketPath
+        self.ringName = ringName
     }
     
     func connect() -> Bool {
@@ -537,14 +639,109 @@ class SocketManager {
             return false
         }
 
+        if let ringName = ringName {
+            guard mapFrameRing(named: ringName) else {
+                close(clientSocket)
+                clientSocket = -1
+                return false
+            }
+        }
+
         Logger.log("Successfully connected to Python server")
         isConnected = true
         return true
     }
     
+    /// shm_open is variadic, so Swift does not import it. The mode argument is only read
+    /// with O_CREAT, which makes calling it through a two-argument signature safe here.
+    private static let shmOpenReadOnly: (@convention(c) (UnsafePointer<CChar>, Int32) -> Int32)? = {
+        guard let symbol = dlsym(UnsafeMutableRawPointer(bitPattern: -2), "shm_open") else { return nil } // RTLD_DEFAULT
+        return unsafeBitCast(symbol, to: (@convention(c) (UnsafePointer<CChar>, Int32) -> Int32).self)
+    }()
+    
+    private func mapFrameRing(named name: String) -> Bool {
+        guard let shmOpen = Self.shmOpenReadOnly else {
+            Logger.log("Error: shm_open is not available")
+            return false
+        }
+        
+        let fd = shmOpen(name, O_RDONLY)
+        guard fd != -1 else {
+            Logger.log("Error opening shared-memory frame ring: \(String(cString: strerror(errno)))")
+            return false
+        }
+        defer { close(fd) }
+        
+        let mapped = mmap(nil, Self.ringSlots * Self.ringSlotSize, PROT_READ, MAP_SHARED, fd, 0)
+        guard mapped != MAP_FAILED, let base = mapped else {
+            Logger.log("Error mapping shared-memory frame ring: \(String(cString: strerror(errno)))")
+            return false
+        }
+        
+        ringBase = base
+        Logger.log("Mapped shared-memory frame ring \(name)")
+        return true
+    }
+    
+    private func readFully(_ buffer: UnsafeMutableRawPointer, count: Int) -> Int {
+        var total = 0
+        while total < count {
+            let bytesRead = read(clientSocket, buffer + total, count - total)
+            guard bytesRead > 0 else { return total == 0 ? bytesRead : total }
+            total += bytesRead
+        }
+        return total
+    }
+    
+    private func readRingFrame(from ringBase: UnsafeMutableRawPointer) -> Data? {
+        var message = [UInt8](repeating: 0, count: Self.ringMessageSize)
+        
+        while true {
+            let bytesRead = message.withUnsafeMutableBytes { readFully($0.baseAddress!, count: Self.ringMessageSize) }
+            guard bytesRead == Self.ringMessageSize else {
+                if bytesRead == 0 {
+                    Logger.log("Server disconnected gracefully")
+                } else {
+                    Logger.log("Error reading frame notification: \(bytesRead) bytes read")
+                }
+                disconnect()
+                return nil
+            }
+            
+            let (slot, frameSize, sequence) = message.withUnsafeBytes { ptr in
+                (Int(UInt32(littleEndian: ptr.loadUnaligned(fromByteOffset: 0, as: UInt32.self))),
+                 Int(UInt32(littleEndian: ptr.loadUnaligned(fromByteOffset: 4, as: UInt32.self))),
+                 UInt64(littleEndian: ptr.loadUnaligned(fromByteOffset: 8, as: UInt64.self)))
+            }
+            
+            guard slot < Self.ringSlots && frameSize > 0 && frameSize <= Self.ringSlotSize - Self.ringSlotHeaderSize else {
+                Logger.log("Invalid frame notification received: slot \(slot), size \(frameSize)")
+                disconnect()
+                return nil
+            }
+            
+            let slotBase = ringBase + slot * Self.ringSlotSize
+            let frameData = Data(bytes: slotBase + Self.ringSlotHeaderSize, count: frameSize)
+            
+            // The writer zeroes the sequence before reusing a slot, so a mismatch means we fell behind.
+            // The barrier keeps the header load from being reordered before the frame copy on ARM.
+            OSMemoryBarrier()
+            guard UInt64(littleEndian: slotBase.load(as: UInt64.self)) == sequence else {
+                Logger.log("Dropped frame #\(sequence): overwritten in shared memory before it was read")
+                continue
+            }
+            
+            return frameData
+        }
+    }
+    
     func readFrameData() -> Data? {
         guard isConnected && clientSocket != -1 else { return nil }
         
+        if let ringBase = ringBase {
+            return readRingFrame(from: ringBase)
+        }
+        
         // Read the 4-byte size header (little-endian)
         var sizeBuffer: UInt32 = 0
         let bytesReadSize = withUnsafeMutableBytes(of: &sizeBuffer) { ptr in
@@ -563,7 +760,8 @@ class SocketManager {
         
         let frameSize = Int(UInt32(littleEndian: sizeBuffer))
         
-        guard frameSize > 0 && frameSize < 10_000_000 else {
+        // Raw BGR frames are much larger than JPEG (~6 MB at 1080p)
+        guard frameSize > 0 && frameSize < 64_000_000 else {
             Logger.log("Invalid frame size received: \(frameSize)")
             disconnect()
             return nil
@@ -594,6 +792,10 @@ class SocketManager {
             close(clientSocket)
             clientSocket = -1
         }
+        if let base = ringBase {
+            munmap(base, Self.ringSlots * Self.ringSlotSize)
+            ringBase = nil
+        }
         isConnected = false
     }
     
@@ -653,7 +855,8 @@ class Application {
         }
         
         self.config = config
-        self.socketManager = SocketManager(socketPath: config.socketPath)
+        self.socketManager = SocketManager(socketPath: config.socketPath,
+                                           ringName: config.sharedMemoryFrames ? config.sharedMemoryName : nil)
         self.frameProcessor = FrameProcessor(config: config, modelManager: modelManager)
         
         // Create save directory if needed
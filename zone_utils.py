@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Safe Zone helpers shared by the Python tools.
+
+Zones are stored in zone_config.json as normalized (0-1) points. These helpers turn
+them into a float32 (N, 2) array and test detection points against the polygon using
+the same ray-casting rule as SafeZone in main.swift. Code that runs per-frame zone
+checks should call warm_up() once at startup.
+"""
+
+import numpy as np
+
+# numba (and LLVM) is only imported the first time a zone check runs
+_in_poly_kernel = None
+
+def polygon_from_config(config):
+    """Build the float32 (N, 2) polygon array from a loaded zone config"""
+    return np.asarray([(point["x"], point["y"]) for point in config["points"]], np.float32).reshape(-1, 2)
+
+def _crossing_test(px, py, poly):
+    """Return True if (px, py) lies inside the polygon (crossing-number test)"""
+    count = poly.shape[0]
+    if count < 3:
+        return False
+
+    inside = False
+    j = count - 1
+    for i in range(count):
+        xi, yi = poly[i, 0], poly[i, 1]
+        xj, yj = poly[j, 0], poly[j, 1]
+        if ((yi > py) != (yj > py)) and (px < (xj - xi) * (py - yi) / (yj - yi) + xi):
+            inside = not inside
+        j = i
+
+    return inside
+
+def _get_in_poly_kernel():
+    """Compile the crossing test with numba if it is installed, else use it as plain Python"""
+    global _in_poly_kernel
+    
+    if _in_poly_kernel is None:
+        try:
+            from numba import njit
+            _in_poly_kernel = njit(cache=True)(_crossing_test)
+        except ImportError:
+            _in_poly_kernel = _crossing_test
+    return _in_poly_kernel
+
+def in_poly(px, py, poly):
+    """Return True if (px, py) lies inside the float32 (N, 2) polygon"""
+    return _get_in_poly_kernel()(px, py, poly)
+
+def warm_up():
+    """Compile in_poly for the float32 (N, 2) signature so the first real check isn't slow"""
+    in_poly(0.5, 0.5, np.array([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)], np.float32))